@@ -0,0 +1,86 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from typing import Dict, List, Optional
+
+
+def is_parquet(path: str) -> bool:
+    """
+    Check whether a path refers to a Parquet file.
+
+    Args:
+    path (str): Path to the file.
+
+    Returns:
+    bool: True if the file has a .parquet extension.
+    """
+    return path.endswith('.parquet')
+
+
+def read_header(path: str) -> List[str]:
+    """
+    Read only the column names of a CSV or Parquet file.
+
+    Args:
+    path (str): Path to the file.
+
+    Returns:
+    list: The column names.
+    """
+    if is_parquet(path):
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def read_frame(path: str, columns: Optional[List[str]] = None,
+               dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Read a CSV or Parquet file into a DataFrame, dispatching on the file extension.
+
+    Args:
+    path (str): Path to the file.
+    columns (list, optional): Columns to read. Default is all columns.
+    dtype (dict, optional): Column dtypes to apply. Default is None.
+
+    Returns:
+    pd.DataFrame: The loaded DataFrame.
+    """
+    if is_parquet(path):
+        df = pd.read_parquet(path, columns=columns)
+        return df.astype(dtype) if dtype else df
+
+    # Parse with the multithreaded pyarrow reader. pandas' pyarrow engine infers column types
+    # before applying dtype, which turns IDs like '00042' into 42.0, so typed columns are
+    # parsed as text and cast afterwards. Quoted fields may span lines, as pandas allows.
+    parse_options = pacsv.ParseOptions(newlines_in_values=True)
+    convert_options = pacsv.ConvertOptions(include_columns=columns or [],
+                                           column_types={column: pa.string() for column in dtype or {}},
+                                           strings_can_be_null=True)
+    df = pacsv.read_csv(path, parse_options=parse_options, convert_options=convert_options).to_pandas()
+    return df.astype(dtype) if dtype else df
+
+
+def write_frame(df: pd.DataFrame, path: str):
+    """
+    Write a DataFrame to a CSV or Parquet file, dispatching on the file extension.
+
+    Parquet is meant for intermediate tables that are read back by a later step;
+    CSV is kept for the outputs that are read by people. CSV files are written with
+    pyarrow's C++ writer, falling back to pandas for columns pyarrow cannot convert.
+
+    Args:
+    df (pd.DataFrame): DataFrame to write.
+    path (str): Destination path.
+
+    Returns:
+    None
+    """
+    if is_parquet(path):
+        df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+        return
+
+    try:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+    except pa.ArrowException:
+        df.to_csv(path, index=False)
@@ -1,5 +1,8 @@
 import pandas as pd
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from typing import List, Tuple
 from matcher import Matcher
 import os
 
@@ -12,119 +15,214 @@ logging.basicConfig(filename='url_matching_main.log', level=logging.INFO,
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
+class MatchOp:
+    """
+    Configuration of a single matching operation.
+
+    The column renames are stored as tuples of (old, new) pairs so instances stay hashable.
+    """
+    name: str
+    file_path1: str
+    file_path2: str
+    id_col1: str
+    id_col2: str
+    url_col1: str
+    url_col2: str
+    company_col1: str
+    company_col2: str
+    matched_path: str
+    unmatched_path: str
+    rename_dict1: Tuple[Tuple[str, str], ...] = ()
+    rename_dict2: Tuple[Tuple[str, str], ...] = ()
+
+    def process_kwargs(self) -> dict:
+        """
+        Build the keyword arguments for Matcher.process.
+
+        Returns:
+            dict: The operation fields, with the renames converted to dictionaries.
+        """
+        kwargs = {field.name: getattr(self, field.name) for field in fields(self)}
+        kwargs['rename_dict1'] = dict(self.rename_dict1) or None
+        kwargs['rename_dict2'] = dict(self.rename_dict2) or None
+        return kwargs
+
+
+# List of matching operations
+OPERATIONS: List[MatchOp] = [
+    MatchOp(
+        name="CRM to Crunchbase Company URL Matching",
+        file_path1='./input_data/VW_SF_CRM_MATCH.csv',
+        file_path2='./input_data/VW_CB_MATCH.csv',
+        id_col1='CRM_ID',
+        id_col2='UUID',
+        url_col1='COMPANY_WEBSITE',
+        url_col2='HOMEPAGE_URL',
+        company_col1='crm_company',
+        company_col2='cb_company',
+        matched_path="./match_tables/crm_cb_matched.csv",
+        unmatched_path="./unmatch_tables/crm_cb_unmatched.csv",
+        rename_dict1=(("ID", "CRM_ID"),)
+    ),
+    MatchOp(
+        name="CRM to Sourcescrub Company URL Matching",
+        file_path1='./input_data/VW_SF_CRM_MATCH.csv',
+        file_path2='./input_data/VW_SS_COMPANY_MATCH.csv',
+        id_col1='CRM_ID',
+        id_col2='ID',
+        url_col1='COMPANY_WEBSITE',
+        url_col2='WEBSITE',
+        company_col1='crm_company',
+        company_col2='ss_company',
+        matched_path="./match_tables/crm_ss_matched.csv",
+        unmatched_path="./unmatch_tables/crm_ss_unmatched.csv",
+        rename_dict1=(("ID", "CRM_ID"),)
+    ),
+    MatchOp(
+        name="Crunchbase to Sourcescrub Company URL Matching",
+        file_path1='./input_data/VW_CB_MATCH.csv',
+        file_path2='./input_data/VW_SS_COMPANY_MATCH.csv',
+        id_col1='UUID',
+        id_col2='ID',
+        url_col1='HOMEPAGE_URL',
+        url_col2='WEBSITE',
+        company_col1='cb_company',
+        company_col2='ss_company',
+        matched_path="./match_tables/cb_ss_matched.csv",
+        unmatched_path="./unmatch_tables/cb_ss_unmatched.csv",
+        rename_dict1=(("ID", "CRM_ID"),)
+    ),
+    MatchOp(
+        name="CRM to Brightdata Company Website URL Matching",
+        file_path1='./input_data/VW_SF_CRM_MATCH.csv',
+        file_path2='./input_data/VW_BD_COMPANY_MATCH.csv',
+        id_col1='CRM_ID',
+        id_col2='ID',
+        url_col1='COMPANY_WEBSITE',
+        url_col2='WEBSITE',
+        company_col1='crm_company',
+        company_col2='bd_company',
+        matched_path="./match_tables/crm_bd_comp_matched.csv",
+        unmatched_path="./unmatch_tables/crm_bd_comp_unmatched.csv",
+        rename_dict1=(("ID", "CRM_ID"),),
+        rename_dict2=(("COMPANY_WEBSITE", "WEBSITE"),)
+    ),
+    MatchOp(
+        name="CRM to Brightdata Linkedin Company URL Matching",
+        file_path1='./input_data/linkedin_crm_comp.parquet',
+        file_path2='./input_data/linkedin_bd_comp.parquet',
+        id_col1='CRM_ID',
+        id_col2='ID',
+        url_col1='LINKEDIN_URL_COMPANY',
+        url_col2='LINKEDIN_URL',
+        company_col1='crm_company',
+        company_col2='bd_company',
+        matched_path="./match_tables/crm_bd_linkedin_comp_matched.csv",
+        unmatched_path="./unmatch_tables/crm_bd_comp_unmatched.csv",
+        rename_dict1=(("ID", "CRM_ID"),)
+    ),
+    MatchOp(
+        name="CRM to Brightdata Linkedin People URL Matching",
+        file_path1='./input_data/VW_SF_CRM_MATCH.csv',
+        file_path2='./input_data/VW_BD_PEOPLE_MATCH.csv',
+        id_col1='CRM_ID',
+        id_col2='ID',
+        url_col1='LINKEDIN_URL_PERSON',
+        url_col2='LINKEDIN_URL_PERSON_BD',
+        company_col1='crm_company',
+        company_col2='bd_company',
+        matched_path="./match_tables/crm_bd_people_matched.csv",
+        unmatched_path="./unmatch_tables/crm_bd_people_unmatched.csv",
+        rename_dict1=(("ID", "CRM_ID"),),
+        rename_dict2=(("LINKEDIN_URL_PERSON", "LINKEDIN_URL_PERSON_BD"),)
+    )
+]
+
+# Operations whose inputs are generated from the results of the other operations
+DEPENDENT_OPERATIONS = {'CRM to Brightdata Linkedin Company URL Matching'}
+
+# Operation whose matched table is used to generate the inputs of the dependent operations
+SOURCE_OPERATION = 'CRM to Brightdata Company Website URL Matching'
+
+def run_operations(operations: List[MatchOp]):
+    """
+    Run a group of matching operations one after another in a worker process.
+
+    The operations of a group share their first input file and one Matcher, so the
+    table cache parses that file once per group instead of once per operation.
+    Only the matched table of SOURCE_OPERATION is sent back to the parent process;
+    the others are already saved and would only be pickled and held in memory.
+
+    Args:
+        operations (List[MatchOp]): The matching operations to run.
+
+    Returns:
+        pd.DataFrame: DataFrame with matched companies of SOURCE_OPERATION if it is in the group, otherwise None.
+    """
+    matcher = Matcher()
+    source_result = None
+    for operation in operations:
+        matched_df = matcher.process(**operation.process_kwargs())
+        if operation.name == SOURCE_OPERATION:
+            source_result = matched_df
+        logger.info(f"Completed {operation.name}")
+    return source_result
+
+
 def main():
     try:
         matcher = Matcher()
 
-        # List of matching operations
-        matching_operations = [
-        {
-                "name": "CRM to Crunchbase Company URL Matching",
-                "file_path1": './input_data/VW_SF_CRM_MATCH.csv',
-                "file_path2": './input_data/VW_CB_MATCH.csv',
-                "id_col1": 'CRM_ID',
-                "id_col2": 'UUID',
-                "url_col1": 'COMPANY_WEBSITE',
-                "url_col2": 'HOMEPAGE_URL',
-                "company_col1": 'crm_company',
-                "company_col2": 'cb_company',
-                "matched_path": "./match_tables/crm_cb_matched.csv",
-                "unmatched_path": "./unmatch_tables/crm_cb_unmatched.csv",
-                "rename_dict1": {"ID": "CRM_ID"},
-                "rename_dict2": None
-            },
-            {
-                "name": "CRM to Sourcescrub Company URL Matching",
-                "file_path1": './input_data/VW_SF_CRM_MATCH.csv',
-                "file_path2": './input_data/VW_SS_COMPANY_MATCH.csv',
-                "id_col1": 'CRM_ID',
-                "id_col2": 'ID',
-                "url_col1": 'COMPANY_WEBSITE',
-                "url_col2": 'WEBSITE',
-                "company_col1": 'crm_company',
-                "company_col2": 'ss_company',
-                "matched_path": "./match_tables/crm_ss_matched.csv",
-                "unmatched_path": "./unmatch_tables/crm_ss_unmatched.csv",
-                "rename_dict1": {"ID": "CRM_ID"},
-                "rename_dict2": None
-            },
-            {
-                "name": "Crunchbase to Sourcescrub Company URL Matching",
-                "file_path1": './input_data/VW_CB_MATCH.csv',
-                "file_path2": './input_data/VW_SS_COMPANY_MATCH.csv',
-                "id_col1": 'UUID',
-                "id_col2": 'ID',
-                "url_col1": 'HOMEPAGE_URL',
-                "url_col2": 'WEBSITE',
-                "company_col1": 'cb_company',
-                "company_col2": 'ss_company',
-                "matched_path": "./match_tables/cb_ss_matched.csv",
-                "unmatched_path": "./unmatch_tables/cb_ss_unmatched.csv",
-                "rename_dict1": {"ID": "CRM_ID"},
-                "rename_dict2": None
-            },
-            {
-                "name": "CRM to Brightdata Company Website URL Matching",
-                "file_path1": './input_data/VW_SF_CRM_MATCH.csv',
-                "file_path2": './input_data/VW_BD_COMPANY_MATCH.csv',
-                "id_col1": 'CRM_ID',
-                "id_col2": 'ID',
-                "url_col1": 'COMPANY_WEBSITE',
-                "url_col2": 'WEBSITE',
-                "company_col1": 'crm_company',
-                "company_col2": 'bd_company',
-                "matched_path": "./match_tables/crm_bd_comp_matched.csv",
-                "unmatched_path": "./unmatch_tables/crm_bd_comp_unmatched.csv",
-                "rename_dict1": {"ID": "CRM_ID"},
-                "rename_dict2": {"COMPANY_WEBSITE": "WEBSITE"}
-            },
-            {
-                "name": "CRM to Brightdata Linkedin Company URL Matching",
-                "file_path1": './input_data/linkedin_crm_comp.csv',
-                "file_path2": './input_data/linkedin_bd_comp.csv',
-                "id_col1": 'CRM_ID',
-                "id_col2": 'ID',
-                "url_col1": 'LINKEDIN_URL_COMPANY',
-                "url_col2": 'LINKEDIN_URL',
-                "company_col1": 'crm_company',
-                "company_col2": 'bd_company',
-                "matched_path": "./match_tables/crm_bd_linkedin_comp_matched.csv",
-                "unmatched_path": "./unmatch_tables/crm_bd_comp_unmatched.csv",
-                "rename_dict1": {"ID": "CRM_ID"},
-                "rename_dict2": None
-            },
-            {
-                "name": "CRM to Brightdata Linkedin People URL Matching",
-                "file_path1": './input_data/VW_SF_CRM_MATCH.csv',
-                "file_path2": './input_data/VW_BD_PEOPLE_MATCH.csv',
-                "id_col1": 'CRM_ID',
-                "id_col2": 'ID',
-                "url_col1": 'LINKEDIN_URL_PERSON',
-                "url_col2": 'LINKEDIN_URL_PERSON_BD',
-                "company_col1": 'crm_company',
-                "company_col2": 'bd_company',
-                "matched_path": "./match_tables/crm_bd_people_matched.csv",
-                "unmatched_path": "./unmatch_tables/crm_bd_people_unmatched.csv",
-                "rename_dict1": {"ID": "CRM_ID"},
-                "rename_dict2": {"LINKEDIN_URL_PERSON": "LINKEDIN_URL_PERSON_BD"}
-            }
-        ]
-
-        for operation in matching_operations:
-            logger.info(f"Starting {operation['name']}")
+        independent_operations = [op for op in OPERATIONS if op.name not in DEPENDENT_OPERATIONS]
+        dependent_operations = [op for op in OPERATIONS if op.name in DEPENDENT_OPERATIONS]
+
+        # Matched DataFrame of SOURCE_OPERATION, read from disk if it is not available
+        source_result = None
+
+        # Group the independent operations by their first input file, so each group parses it once
+        groups = {}
+        for operation in independent_operations:
+            groups.setdefault(operation.file_path1, []).append(operation)
+
+        # Run the groups in parallel, one per worker process; only one copy of each
+        # first input is in memory at a time, at the cost of running a group's operations in sequence
+        max_workers = min(len(groups), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for group in groups.values():
+                for operation in group:
+                    logger.info(f"Starting {operation.name}")
+                futures[executor.submit(run_operations, group)] = group
+
+            for future in as_completed(futures):
+                names = ', '.join(operation.name for operation in futures[future])
+                try:
+                    result = future.result()
+                    if result is not None:
+                        source_result = result
+                except Exception as e:
+                    logger.error(f"Error in {names}: {str(e)}")
+                    print(f"Error in {names}: {str(e)}")
+
+        # Generate input of brightdata linkedin company Url Match
+        logger.info("Generating input for Brightdata LinkedIn company URL matching")
+        get_bd_linkedin_company_urls(result_df=source_result)
+
+        for operation in dependent_operations:
+            logger.info(f"Starting {operation.name}")
             try:
-                if operation['name'] == 'CRM to Brightdata Linkedin People URL Matching':
-                    # Generate input of brightdata linkedin company Url Match
-                    logger.info("Generating input for Brightdata LinkedIn company URL matching")
-                    get_bd_linkedin_company_urls()
-                matcher.process(**operation)
-                logger.info(f"Completed {operation['name']}")
+                matcher.process(**operation.process_kwargs())
+                logger.info(f"Completed {operation.name}")
             except Exception as e:
-                logger.error(f"Error in {operation['name']}: {str(e)}")
-                print(f"Error in {operation['name']}: {str(e)}")
+                logger.error(f"Error in {operation.name}: {str(e)}")
+                print(f"Error in {operation.name}: {str(e)}")
+
+        # Release the cached input tables
+        matcher.clear_cache()
 
         # duplicacy checking and generating duplicacy tables for all matched outputs
-        process_all_matched_outputs(matching_operations)
+        process_all_matched_outputs([op.matched_path for op in OPERATIONS])
 
         logger.info("URL matching process completed successfully")
 
@@ -133,4 +231,4 @@ def main():
         print(f"An unexpected error occurred: {str(e)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,7 +1,8 @@
 import pandas as pd
 import logging
-from tqdm import tqdm
 from preprocessor import URLPreprocessor
+from frame_io import read_header, read_frame, write_frame
+from postprocess import anti_join
 import os
 
 class Matcher:
@@ -19,15 +20,27 @@ class Matcher:
         
         # Initialize the URL preprocessor
         self.preprocessor = URLPreprocessor()
+        
+        # Cleaned DataFrames keyed by file and columns, so repeated loads skip the CSV parse
+        self._frame_cache = {}
+
+    def clear_cache(self):
+        """
+        Release the cached DataFrames and extracted company names.
+        """
+        self._frame_cache.clear()
+        self.preprocessor.clear_cache()
 
     def load_clean_and_rename_dataframe(self, file_path, id_column, url_column, rename_dict=None):
         """
-        Load a CSV file into a DataFrame, clean it by removing null values, and rename columns if needed.
+        Load a CSV or Parquet file into a DataFrame, clean it by removing null values, and rename columns if needed.
+        
+        Only the ID and URL columns are read, both as strings.
         
         Args:
-            file_path (str): Path to the CSV file.
-            id_column (str): Name of the ID column.
-            url_column (str): Name of the URL column.
+            file_path (str): Path to the CSV or Parquet file.
+            id_column (str): Name of the ID column (after renaming).
+            url_column (str): Name of the URL column (after renaming).
             rename_dict (dict, optional): Dictionary of columns to rename. Default is None.
         
         Returns:
@@ -38,8 +51,26 @@ class Matcher:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"The file {file_path} does not exist.")
 
-            # Load the CSV file
-            df = pd.read_csv(file_path)
+            # Map the required columns back to their names in the file
+            header = read_header(file_path)
+            source_names = {v: k for k, v in (rename_dict or {}).items() if k in header}
+            src_id = source_names.get(id_column, id_column)
+            src_url = source_names.get(url_column, url_column)
+            
+            # Check if required columns exist
+            if src_id not in header or src_url not in header:
+                raise KeyError(f"Required columns {id_column} or {url_column} not found in the DataFrame.")
+
+            # Reuse the frame if the same columns of this file were already loaded
+            cache_key = (os.path.realpath(file_path), os.path.getmtime(file_path),
+                         src_id, id_column, src_url, url_column)
+            if cache_key in self._frame_cache:
+                self.logger.info(f"Loaded DataFrame from {file_path} from cache")
+                return self._frame_cache[cache_key].copy(deep=False)
+
+            # Load only the required columns of the file
+            df = read_frame(file_path, columns=[src_id, src_url],
+                            dtype={src_id: 'string', src_url: 'string'})
             
             # Check if DataFrame is empty
             if df.empty:
@@ -50,13 +81,9 @@ class Matcher:
             
             # Rename columns if rename_dict is provided
             if rename_dict:
-                df.rename(columns=rename_dict, inplace=True)
+                df.rename(columns={src_id: id_column, src_url: url_column}, inplace=True)
                 self.logger.info(f"Renamed columns: {rename_dict}")
             
-            # Check if required columns exist
-            if id_column not in df.columns or url_column not in df.columns:
-                raise KeyError(f"Required columns {id_column} or {url_column} not found in the DataFrame.")
-            
             # Remove rows with null values in ID or URL columns
             initial_rows = len(df)
             df.dropna(subset=[id_column, url_column], inplace=True)
@@ -68,7 +95,10 @@ class Matcher:
             # Log the shape after removing null values
             self.logger.info(f"Shape after removing null values: {df.shape}")
             
-            return df
+            df = self._optimize_dtypes(df)
+            
+            self._frame_cache[cache_key] = df
+            return df.copy(deep=False)
 
         except Exception as e:
             error_msg = f"Error in load_clean_and_rename_dataframe: {str(e)}"
@@ -76,10 +106,42 @@ class Matcher:
             print(error_msg)  # Ensure the error is printed to the console
             return None
 
+    def _optimize_dtypes(self, df):
+        """
+        Shrink the memory footprint of a DataFrame of string columns.
+        
+        Columns with many repeated values become categoricals, the others use pyarrow-backed strings.
+        
+        Args:
+            df (pd.DataFrame): Input DataFrame.
+        
+        Returns:
+            pd.DataFrame: DataFrame with downcast columns.
+        """
+        # Measuring deep memory usage scans every string, so only do it when it is logged
+        log_memory = self.logger.isEnabledFor(logging.DEBUG)
+        if log_memory:
+            memory_before = df.memory_usage(deep=True).sum()
+        
+        for column in df.columns:
+            if len(df) and df[column].nunique() / len(df) < 0.5:
+                df[column] = df[column].astype('category')
+            else:
+                df[column] = df[column].astype('string[pyarrow]')
+        
+        if log_memory:
+            memory_after = df.memory_usage(deep=True).sum()
+            self.logger.debug(f"Optimized dtypes: {df.dtypes.to_dict()}. "
+                              f"Memory usage {memory_before / 1e6:.2f} MB -> {memory_after / 1e6:.2f} MB")
+        
+        return df
+
     def preprocess_urls(self, df, url_column, company_column):
         """
         Preprocess URLs in a DataFrame to extract company names.
         
+        Rows without a URL get a missing company name instead of being parsed.
+        
         Args:
             df (pd.DataFrame): Input DataFrame.
             url_column (str): Name of the column containing URLs.
@@ -87,29 +149,31 @@ class Matcher:
         
         Returns:
             pd.DataFrame: DataFrame with preprocessed URLs.
+        
+        Raises:
+            ValueError: If the input DataFrame is None or empty.
         """
-        try:
-            if df is None or df.empty:
-                raise ValueError("Input DataFrame is None or empty.")
+        if df is None or df.empty:
+            raise ValueError("Input DataFrame is None or empty.")
 
-            # Ensure URL column is string type
-            df[url_column] = df[url_column].astype(str)
-            
-            # Extract company names from URLs
-            tqdm.pandas(desc=f"Extracting company names for {company_column}")
-            df[company_column] = df[url_column].progress_apply(self.preprocessor.extract_domain_and_company)
-            
-            self.logger.info(f"Preprocessed URLs and extracted company names into '{company_column}' column")
-            
-            return df
-
-        except Exception as e:
-            error_msg = f"Error in preprocess_urls: {str(e)}"
-            self.logger.error(error_msg)
-            print(error_msg)  # Ensure the error is printed to the console
-            return None
+        # Ensure URL column is a nullable string type (categorical URL columns already hold strings)
+        if not isinstance(df[url_column].dtype, pd.CategoricalDtype):
+            df[url_column] = df[url_column].astype('string')
+        urls = df[url_column]
+        
+        # Extract company names once per distinct non-null URL and map them back onto the rows
+        unique_urls = pd.Series(urls[urls.notna()].unique())
+        companies = self.preprocessor.extract_series(unique_urls)
+        df[company_column] = urls.map(dict(zip(unique_urls, companies)))
+        self.logger.info(f"Extracted company names for {len(unique_urls)} unique URLs "
+                         f"out of {len(df)} rows ({len(unique_urls) / len(df):.1%})")
+        
+        self.logger.info(f"Preprocessed URLs and extracted company names into '{company_column}' column")
+        
+        return df
 
-    def match_companies(self, df1, df2, company_col1, company_col2, id_col1, id_col2, url_col1, url_col2):
+    def match_companies(self, df1, df2, company_col1, company_col2, id_col1, id_col2, url_col1, url_col2,
+                        match_type='exact', block_prefix=0):
         """
         Match companies between two DataFrames.
         
@@ -122,6 +186,9 @@ class Matcher:
             id_col2 (str): Name of the ID column in df2.
             url_col1 (str): Name of the URL column in df1.
             url_col2 (str): Name of the URL column in df2.
+            match_type (str, optional): Type of matching to perform ('exact' or 'fuzzy'). Default is 'exact'.
+            block_prefix (int, optional): For fuzzy matching, only compare companies sharing this many
+                leading characters. Default is 0 (compare all companies).
         
         Returns:
             pd.DataFrame: DataFrame with matched companies.
@@ -130,14 +197,26 @@ class Matcher:
             if df1 is None or df2 is None or df1.empty or df2.empty:
                 raise ValueError("One or both input DataFrames are None or empty.")
 
-            # Perform exact matching
-            results = self.preprocessor.process_companys(df1[company_col1], df2[company_col2], match_type='exact')
-            
-            # Add matching results to df1
-            df1['exact_match'] = [match for _, match, _ in results]
-            
-            # Merge DataFrames based on exact matches
-            result_df = pd.merge(df1, df2, left_on='exact_match', right_on=company_col2)
+            # Only the ID, URL and company columns are carried into the join
+            df1_small = df1[[id_col1, url_col1, company_col1]]
+            df2_small = df2[[id_col2, url_col2, company_col2]]
+
+            if match_type == 'exact' and df1.index.name == company_col1 and df2.index.name == company_col2:
+                # Both DataFrames are indexed by company name, so join on the existing indexes
+                result_df = df1_small.merge(df2_small, left_index=True, right_index=True, how='inner')
+            elif match_type == 'exact':
+                # Exact matching is a plain equi-join, so let pandas hash-join the company columns
+                result_df = df1_small.merge(df2_small, left_on=company_col1, right_on=company_col2, how='inner')
+            else:
+                # Find the best candidate in df2 for every company in df1
+                results = self.preprocessor.process_companys(df1[company_col1], df2[company_col2], match_type=match_type,
+                                                             block_prefix=block_prefix)
+                match_column = f'{match_type}_match'
+                df1_small = df1_small.assign(**{match_column: [match for _, match, _ in results]})
+                
+                # Merge DataFrames based on the matched candidates
+                result_df = df1_small.merge(df2_small.reset_index(drop=True), left_on=match_column,
+                                            right_on=company_col2, how='inner')
             
             # Select desired columns
             result_df = result_df[[id_col1, id_col2, url_col1, url_col2, company_col1, company_col2]]
@@ -157,7 +236,7 @@ class Matcher:
 
     def save_results(self, matched_df, unmatched_df, matched_path, unmatched_path):
         """
-        Save matched and unmatched results to CSV files.
+        Save matched and unmatched results to CSV or Parquet files, depending on the path extension.
         
         Args:
             matched_df (pd.DataFrame): DataFrame with matched companies.
@@ -172,8 +251,8 @@ class Matcher:
             if matched_df.empty and unmatched_df.empty:
                 raise ValueError("Both matched and unmatched DataFrames are empty")
 
-            matched_df.to_csv(matched_path, index=False)
-            unmatched_df.to_csv(unmatched_path, index=False)
+            write_frame(matched_df, matched_path)
+            write_frame(unmatched_df, unmatched_path)
             
             self.logger.info(f"Saved matched results to {matched_path}")
             self.logger.info(f"Saved unmatched results to {unmatched_path}")
@@ -190,8 +269,8 @@ class Matcher:
         Process two input files, match companies, and save results.
         
         Args:
-            file_path1 (str): Path to the first input CSV file.
-            file_path2 (str): Path to the second input CSV file.
+            file_path1 (str): Path to the first input CSV or Parquet file.
+            file_path2 (str): Path to the second input CSV or Parquet file.
             id_col1 (str): Name of the ID column in the first DataFrame.
             id_col2 (str): Name of the ID column in the second DataFrame.
             url_col1 (str): Name of the URL column in the first DataFrame.
@@ -203,6 +282,9 @@ class Matcher:
             rename_dict1 (dict, optional): Dictionary of columns to rename in the first DataFrame. Default is None.
             rename_dict2 (dict, optional): Dictionary of columns to rename in the second DataFrame. Default is None.
             name(str): name of the process 
+        
+        Returns:
+            pd.DataFrame: DataFrame with matched companies, or None if processing failed.
         """
         try:
             # Load, clean, and rename data
@@ -216,8 +298,9 @@ class Matcher:
             df1 = self.preprocess_urls(df1, url_col1, company_col1)
             df2 = self.preprocess_urls(df2, url_col2, company_col2)
             
-            if df1 is None or df2 is None:
-                raise ValueError("Error occurred during URL preprocessing")
+            # Index both DataFrames by company name once, so the join reuses it
+            df1 = df1.set_index(company_col1, drop=False)
+            df2 = df2.set_index(company_col2, drop=False)
 
             # Match companies
             matched_df = self.match_companies(df1, df2, company_col1, company_col2, id_col1, id_col2, url_col1, url_col2)
@@ -225,16 +308,22 @@ class Matcher:
             if matched_df is None:
                 raise ValueError("Error occurred during company matching")
 
-            # Identify unmatched companies
-            unmatched_df = df1[~df1[id_col1].isin(matched_df[id_col1])][[id_col1, url_col1]]
+            # Return a plain positional index rather than the company index used for the join
+            matched_df = matched_df.reset_index(drop=True)
+
+            # Identify unmatched companies as the IDs of df1 without any matched row
+            unmatched_df = anti_join(df1[[id_col1, url_col1]], id_col1, matched_df[id_col1])
             
             # Save results
             self.save_results(matched_df, unmatched_df, matched_path, unmatched_path)
+            
+            return matched_df
 
         except Exception as e:
             error_msg = f"Error in process: {str(e)}"
-            self.logger.error(error_msg)
+            self.logger.exception(error_msg)
             print(error_msg)  # Ensure the error is printed to the console
+            return None
 
 # Example usage
 if __name__ == "__main__":
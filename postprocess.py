@@ -1,42 +1,90 @@
+import numpy as np
 import pandas as pd
 import logging
 import os
-from typing import List, Dict
+from typing import List, Optional
+
+from frame_io import read_frame, write_frame
 
 logging.basicConfig(filename='url_matching_main.log', level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Number of rows read at a time when streaming the matched tables
+CHUNK_SIZE = 250_000
+
+
+def read_id_table(path: str, id_columns: List[str]) -> pd.DataFrame:
+    """
+    Read a CSV or Parquet table with its ID columns kept as text, the same way the
+    Matcher reads its inputs, so IDs such as '00015' compare equal across both.
+
+    Args:
+    path (str): Path to the file.
+    id_columns (list): Columns holding IDs.
+
+    Returns:
+    pd.DataFrame: The loaded table.
+    """
+    return read_frame(path, dtype={column: 'string' for column in id_columns})
+
+
+def anti_join(df: pd.DataFrame, column: str, values: pd.Series) -> pd.DataFrame:
+    """
+    Keep the rows of a DataFrame whose value in a column does not appear in values,
+    using a single hash join instead of an isin over a materialized list.
+
+    Args:
+    df (pd.DataFrame): DataFrame to filter.
+    column (str): Column of df to compare.
+    values (pd.Series): Values to exclude.
 
-def get_bd_linkedin_company_urls(): 
+    Returns:
+    pd.DataFrame: The rows of df without a match in values.
+    """
+    keys = values.drop_duplicates().to_frame(name=column)
+    merged = df.merge(keys, on=column, how='left', indicator=True)
+    return merged[merged['_merge'] == 'left_only'].drop(columns='_merge')
+
+
+def get_bd_linkedin_company_urls(result_df: Optional[pd.DataFrame] = None):
     """
     Function to create an input of brightdata company linkedin urls \
-        which not matched with company website to process them separately
+        which not matched with company website to process them separately.
+    The CRM and Brightdata company tables are read in full, since all their columns are written out.
+
+    Args:
+    result_df (pd.DataFrame, optional): Already computed CRM to Brightdata company website matches, \
+        read from disk if not passed in.
+
+    Returns:
+    None
     """
     try:
         # loading matched company website urls
-        result_df = pd.read_csv("./match_tables/crm_bd_comp_matched.csv")
+        if result_df is None:
+            result_df = read_id_table("./match_tables/crm_bd_comp_matched.csv", ['CRM_ID', 'ID'])
 
         # load the CRM URLs
-        crm_df = pd.read_csv('./input_data/VW_SF_CRM_MATCH.csv')
+        crm_df = read_id_table('./input_data/VW_SF_CRM_MATCH.csv', ['ID'])
 
         # load BD urls
-        bd_df = pd.read_csv('./input_data/VW_BD_COMPANY_MATCH.csv')
+        bd_df = read_id_table('./input_data/VW_BD_COMPANY_MATCH.csv', ['ID'])
 
         # Check if DataFrames are empty
         if result_df.empty or crm_df.empty or bd_df.empty:
             raise ValueError("One or more input DataFrames are empty")
 
         # Generate input for linkedin company url matching 
-        unmatched_crm = crm_df[~crm_df['ID'].isin(result_df['CRM_ID'].to_list())]
-        unmatched_bd = bd_df[~bd_df['ID'].isin(result_df['ID'].to_list())]
+        unmatched_crm = anti_join(crm_df, 'ID', result_df['CRM_ID'])
+        unmatched_bd = anti_join(bd_df, 'ID', result_df['ID'])
 
         # Check if unmatched DataFrames are empty
         if unmatched_crm.empty or unmatched_bd.empty:
             logger.warning("No unmatched records found for LinkedIn company URL matching")
         else:
-            unmatched_crm.to_csv("./input_data/linkedin_crm_comp.csv", index=False)
-            unmatched_bd.to_csv("./input_data/linkedin_bd_comp.csv", index=False)
+            write_frame(unmatched_crm, "./input_data/linkedin_crm_comp.parquet")
+            write_frame(unmatched_bd, "./input_data/linkedin_bd_comp.parquet")
             logger.info("Generated input files for LinkedIn company URL matching")
 
     except FileNotFoundError as e:
@@ -52,52 +100,73 @@ def get_bd_linkedin_company_urls():
         logger.error(error_msg)
         print(error_msg)  # Ensure the error is printed to the console
 
-def process_matched_output(operation: Dict[str, str]):
+def process_matched_output(matched_path: str, chunksize: int = CHUNK_SIZE):
     """
     Process the matched output file, detect duplicates in the last column,
     remove all instances of duplicates (including originals), group duplicates together,
     and save to separate files.
 
+    The file is streamed in two passes of `chunksize` rows: the first counts the
+    values of the last column, the second routes every row to the duplicate or
+    non-duplicate output. Only the duplicate rows are held in memory, so they can
+    be grouped together before they are written. Every column is read as text, so
+    IDs keep their leading zeros and are written the same way in both outputs.
+
     Args:
-    operation (dict): A dictionary containing the operation details.
+    matched_path (str): Path to the matched output file.
+    chunksize (int, optional): Number of rows read at a time. Default is CHUNK_SIZE.
 
     Returns:
     None
     """
     try:
         # Extract the relevant paths and column names
-        matched_path = operation['matched_path']
         file_name = os.path.basename(matched_path)
         dir_name = os.path.dirname(matched_path)
         
-        # Construct the path for the duplicate file
+        # Construct the path for the duplicate file and the temporary non-duplicate file
         duplicate_file = os.path.join(dir_name, file_name.replace('matched', 'duplicate_matched'))
-        
-        # Read the CSV file
-        df = pd.read_csv(matched_path)
-        logging.info(f"Read {matched_path} successfully. Shape: {df.shape}")
+        non_duplicate_file = f"{matched_path}.tmp"
         
         # Identify the last column
-        last_column = df.columns[-1]
+        columns = pd.read_csv(matched_path, nrows=0).columns
+        last_column = columns[-1]
         logging.info(f"Checking for duplicates in column: {last_column}")
         
-        # Find duplicates and non-duplicates
-        duplicates = df[df.duplicated(subset=[last_column], keep=False)]
-        non_duplicates = df.drop_duplicates(subset=[last_column], keep=False)
+        # First pass: count the values of the last column, one chunk at a time
+        counts = pd.Series(dtype='int64')
+        for chunk in pd.read_csv(matched_path, usecols=[last_column], dtype=str, keep_default_na=False,
+                                 chunksize=chunksize):
+            counts = counts.add(chunk[last_column].value_counts(dropna=False), fill_value=0)
+        duplicate_keys = counts.index[counts >= 2]
+        logging.info(f"Read {matched_path} successfully. Shape: ({int(counts.sum())}, {len(columns)})")
+        
+        # Second pass: stream non-duplicates to a temporary file and collect the duplicates
+        pd.DataFrame(columns=columns).to_csv(non_duplicate_file, index=False)
+        duplicate_chunks = []
+        non_duplicate_rows = 0
+        for chunk in pd.read_csv(matched_path, dtype=str, keep_default_na=False, chunksize=chunksize):
+            duplicate_mask = chunk[last_column].isin(duplicate_keys)
+            duplicate_chunks.append(chunk[duplicate_mask])
+            chunk[~duplicate_mask].to_csv(non_duplicate_file, mode='a', header=False, index=False)
+            non_duplicate_rows += int((~duplicate_mask).sum())
+        duplicates = pd.concat(duplicate_chunks) if duplicate_chunks else pd.DataFrame(columns=columns)
         
-        # Sort duplicates by the last column to group them together
-        duplicates_sorted = duplicates.sort_values(by=[last_column])
+        # Sort duplicates by their integer codes to group them together;
+        # with sort=True the codes follow the sorted order of the values
+        codes, _ = pd.factorize(duplicates[last_column], sort=True, use_na_sentinel=False)
+        duplicates_sorted = duplicates.iloc[np.argsort(codes, kind='stable')]
         
         # Log the results
         logging.info(f"Found {len(duplicates)} rows with duplicates based on {last_column}")
-        logging.info(f"Remaining non-duplicate rows: {len(non_duplicates)}")
+        logging.info(f"Remaining non-duplicate rows: {non_duplicate_rows}")
         
-        # Save sorted duplicates to a new file
+        # Save sorted duplicates to a new file, written like the non-duplicates
         duplicates_sorted.to_csv(duplicate_file, index=False)
         logging.info(f"Saved rows with duplicates (grouped together) to {duplicate_file}")
         
         # Save non-duplicates back to the original file
-        non_duplicates.to_csv(matched_path, index=False)
+        os.replace(non_duplicate_file, matched_path)
         logging.info(f"Saved non-duplicate rows back to {matched_path}")
         
     except Exception as e:
@@ -106,25 +175,25 @@ def process_matched_output(operation: Dict[str, str]):
         print(error_msg)  # Ensure the error is printed to the console
         raise
 
-def process_all_matched_outputs(operations: List[Dict[str, str]]):
+def process_all_matched_outputs(matched_paths: List[str]):
     """
     Process all matched outputs for the given operations.
 
     Args:
-    operations (list): A list of dictionaries, each containing operation details.
+    matched_paths (list): The matched output paths of the operations.
 
     Returns:
     None
     """
-    for operation in operations:
+    for matched_path in matched_paths:
         try:
-            logging.info(f"Processing matched output for operation: {operation['matched_path']}")
-            process_matched_output(operation)
+            logging.info(f"Processing matched output for operation: {matched_path}")
+            process_matched_output(matched_path)
         except Exception as e:
-            error_msg = f"Failed to process operation: {operation['matched_path']}. Error: {str(e)}"
+            error_msg = f"Failed to process operation: {matched_path}. Error: {str(e)}"
             logging.error(error_msg)
             print(error_msg)  # Ensure the error is printed to the console
             continue
 
 # Usage example:
-# process_all_matched_outputs(matching_operations)
\ No newline at end of file
+# process_all_matched_outputs([op.matched_path for op in OPERATIONS])
\ No newline at end of file
@@ -1,93 +1,171 @@
 import re
+import string
 import tldextract
+from collections import defaultdict
 from typing import Literal, List, Tuple
 from urllib.parse import unquote
 
+import numpy as np
 import pandas as pd
-from polyleven import levenshtein
+from rapidfuzz import process as rf_process
+from rapidfuzz.distance import Levenshtein
 from tqdm import tqdm
 
-class URLPreprocessor:
-    def __init__(self):
+# Reduce the distance matrices with a parallel compiled loop when numba is available
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = prange = None
+
+# Maximum number of cells of the distance matrix scored in one batch
+MAX_SCORE_CELLS = 10_000_000
+
+# Distance marking a company without any candidate; reported as float('inf') in the results
+_NO_MATCH = np.iinfo(np.uint32).max
+
+# Regular expressions used on every URL, compiled once
+_RE_HTTP_HTTP = re.compile(r'^https?://http//')
+_RE_LINKEDIN_QS = re.compile(r'(\?.*)|(\/about.*)')
+_RE_NONWORD = re.compile(r'[^\w\-]')
+
+# Translation table deleting the ASCII characters _RE_NONWORD would remove
+_ASCII_NONWORD = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if c not in string.ascii_letters + string.digits + '_-'))
+_RE_PROTO_WWW = re.compile(r'^(https?://)?(http//)?((www|web)\.)?')
+_RE_SPLIT = re.compile(r'[./]')
+_RE_PREFIX_SUFFIX = re.compile(r'^(?:corp-|corporate-|about-|info-|en-|shop-)|-(?:corp|corporate|about|info|en|shop)$')
+
+# Suffix-list parser built from the bundled snapshot, without fetching the live list or using a disk cache
+_TLD = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+# Domains whose company name is taken from the URL path
+_SOCIAL_DOMAINS = frozenset(('facebook', 'zaubacorp', 'linkedin'))
+
+# Known common suffixes that are hosting platforms rather than company names
+_COMMON_SUFFIXES = frozenset(('business', 'webflow', 'site', 'com'))
 
-        # Initialize common terms set
-        self.common_terms, self.country_codes = self._initialize_common_terms()
+# Common prefixes removed from the domain
+_COMMON_PREFIXES = frozenset(('www', 'web', 'corp', 'corporate', 'about', 'info', 'shop', 'company'))
 
-    def _initialize_common_terms(self) -> set:
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _argmin_rows(scores):
+        """
+        Find the position and value of the first minimum of every row of a score matrix.
+        """
+        best = np.empty(scores.shape[0], np.intp)
+        distances = np.empty(scores.shape[0], scores.dtype)
+        for i in prange(scores.shape[0]):
+            j = 0
+            value = scores[i, 0]
+            for k in range(1, scores.shape[1]):
+                if scores[i, k] < value:
+                    value = scores[i, k]
+                    j = k
+            best[i] = j
+            distances[i] = value
+        return best, distances
+else:
+    def _argmin_rows(scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Initialize a set of common terms and country codes to exclude from company names.
+        Find the position and value of the first minimum of every row of a score matrix.
+        
+        Args:
+            scores (np.ndarray): 2-D matrix of distances with at least one column.
         
         Returns:
-            set: A set of common terms and country_codes
+            Tuple[np.ndarray, np.ndarray]: The column of the row minimum and the minimum, per row.
+        """
+        best = scores.argmin(axis=1)
+        return best, scores[np.arange(scores.shape[0]), best]
+
+# Common terms to exclude from company names, all lowercase
+_COMMON_TERMS = frozenset({
+    # Generic TLDs
+    'com', 'org', 'net', 'info', 'biz', 'edu', 'gov', 'mil', 'int',
+    'ac', 'co', 'io', 'ai', 'app', 'dev', 'tech', 'online', 'store', 'shop',
+    'blog', 'site', 'cloud', 'design', 'agency', 'marketing', 'digital',
+
+    # Country Code TLDs
+    'us', 'uk', 'ca', 'au', 'de', 'fr', 'jp', 'cn', 'in', 'ru', 'br', 'it',
+    'nl', 'es', 'se', 'no', 'fi', 'dk', 'ch', 'at', 'be', 'nz', 'sg', 'ae',
+    'kr', 'za', 'mx', 'ar', 'cl', 'pl', 'cz', 'gr', 'hu', 'pt', 'ro', 'th',
+    'tr', 'ua', 'vn', 'ph', 'my', 'id', 'tw', 'hk', 'me', 'eu',
+
+    # Common URL words and abbreviations
+    'about', 'info', 'contact', 'support', 'help', 'faq', 'news', 'blog',
+    'corp', 'corporate', 'company', 'inc', 'incorporated', 'llc', 'ltd',
+    'limited', 'group', 'intl', 'international', 'global', 'worldwide',
+    'local', 'official', 'home', 'main', 'index', 'web', 'site', 'portal',
+    'login', 'signup', 'register', 'account', 'user', 'customer', 'client',
+    'partner', 'vendor', 'supplier', 'en', 'eng', 'english', 'fr', 'fra', 
+    'french', 'de', 'deu', 'german', 'es', 'esp', 'spanish', 'it', 'ita', 
+    'italian', 'pt', 'por', 'portuguese', 'ru', 'rus', 'russian', 'cn', 
+    'chi', 'chinese', 'jp', 'jpn', 'japanese',
+
+    # E-commerce related
+    'shop', 'store', 'buy', 'sell', 'sale', 'discount', 'deal', 'offer',
+    'product', 'item', 'catalog', 'category', 'cart', 'checkout', 'payment',
+    'order', 'shipping', 'delivery',
+
+    # Business and corporate terms
+    'careers', 'jobs', 'hr', 'human-resources', 'recruitment', 'investor',
+    'investors', 'shareholders', 'press', 'media', 'pr', 'public-relations',
+    'legal', 'privacy', 'terms', 'conditions', 'policy', 'policies',
+    'services', 'solutions', 'products', 'projects', 'portfolio', 'business',
+
+    # Technology-related
+    'app', 'apps', 'api', 'dev', 'developer', 'webmaster', 'admin', 'sys',
+    'system', 'network', 'host', 'domain', 'email', 'mail', 'webmail',
+    'cloud', 'server', 'database', 'data', 'analytics', 'stats', 'metrics',
+
+    # Social media and community
+    'social', 'community', 'forum', 'chat', 'discuss', 'connect', 'follow',
+    'like', 'share', 'tweet', 'post', 'profile', 'user', 'member',
+
+    # Miscellaneous
+    'page', 'pages', 'site', 'sites', 'web', 'internet', 'online', 'digital',
+    'virtual', 'mobile', 'desktop', 'platform', 'service', 'tool', 'resource',
+    'guide', 'tutorial', 'learn', 'education', 'training', 'course', 'program'
+})
+
+# Comprehensive list of country code TLDs
+_COUNTRY_CODES = frozenset({
+    'ac', 'ad', 'ae', 'af', 'ag', 'ai', 'al', 'am', 'ao', 'aq', 'ar', 'as', 'at', 'au', 'aw', 'ax', 'az',
+    'ba', 'bb', 'bd', 'be', 'bf', 'bg', 'bh', 'bi', 'bj', 'bl', 'bm', 'bn', 'bo', 'bq', 'br', 'bs', 'bt',
+    'bv', 'bw', 'by', 'bz', 'ca', 'cc', 'cd', 'cf', 'cg', 'ch', 'ci', 'ck', 'cl', 'cm', 'cn', 'co', 'cr',
+    'cu', 'cv', 'cw', 'cx', 'cy', 'cz', 'de', 'dj', 'dk', 'dm', 'do', 'dz', 'ec', 'ee', 'eg', 'eh', 'er',
+    'es', 'et', 'eu', 'fi', 'fj', 'fk', 'fm', 'fo', 'fr', 'ga', 'gb', 'gd', 'ge', 'gf', 'gg', 'gh', 'gi',
+    'gl', 'gm', 'gn', 'gp', 'gq', 'gr', 'gs', 'gt', 'gu', 'gw', 'gy', 'hk', 'hm', 'hn', 'hr', 'ht', 'hu',
+    'id', 'ie', 'il', 'im', 'in', 'io', 'iq', 'ir', 'is', 'it', 'je', 'jm', 'jo', 'jp', 'ke', 'kg', 'kh',
+    'ki', 'km', 'kn', 'kp', 'kr', 'kw', 'ky', 'kz', 'la', 'lb', 'lc', 'li', 'lk', 'lr', 'ls', 'lt', 'lu',
+    'lv', 'ly', 'ma', 'mc', 'md', 'me', 'mf', 'mg', 'mh', 'mk', 'ml', 'mm', 'mn', 'mo', 'mp', 'mq', 'mr',
+    'ms', 'mt', 'mu', 'mv', 'mw', 'mx', 'my', 'mz', 'na', 'nc', 'ne', 'nf', 'ng', 'ni', 'nl', 'no', 'np',
+    'nr', 'nu', 'nz', 'om', 'pa', 'pe', 'pf', 'pg', 'ph', 'pk', 'pl', 'pm', 'pn', 'pr', 'ps', 'pt', 'pw',
+    'py', 'qa', 're', 'ro', 'rs', 'ru', 'rw', 'sa', 'sb', 'sc', 'sd', 'se', 'sg', 'sh', 'si', 'sk', 'sl',
+    'sm', 'sn', 'so', 'sr', 'ss', 'st', 'sv', 'sx', 'sy', 'sz', 'tc', 'td', 'tf', 'tg', 'th', 'tj', 'tk',
+    'tl', 'tm', 'tn', 'to', 'tr', 'tt', 'tv', 'tw', 'tz', 'ua', 'ug', 'uk', 'us', 'uy', 'uz', 'va', 'vc',
+    've', 'vg', 'vi', 'vn', 'vu', 'wf', 'ws', 'ye', 'yt', 'za', 'zm', 'zw'
+})
+
+class URLPreprocessor:
+    __slots__ = ('common_terms', 'country_codes', '_cache')
+
+    def __init__(self):
+
+        # Share the module-level common terms and country code sets
+        self.common_terms = _COMMON_TERMS
+        self.country_codes = _COUNTRY_CODES
+
+        # Extracted company names keyed by raw URL, shared by every table processed
+        self._cache = {}
+
+    def clear_cache(self):
+        """
+        Release the cached company names.
         """
-        common_terms = {
-            # Generic TLDs
-            'com', 'org', 'net', 'info', 'biz', 'edu', 'gov', 'mil', 'int',
-            'ac', 'co', 'io', 'ai', 'app', 'dev', 'tech', 'online', 'store', 'shop',
-            'blog', 'site', 'cloud', 'design', 'agency', 'marketing', 'digital',
-
-            # Country Code TLDs
-            'us', 'uk', 'ca', 'au', 'de', 'fr', 'jp', 'cn', 'in', 'ru', 'br', 'it',
-            'nl', 'es', 'se', 'no', 'fi', 'dk', 'ch', 'at', 'be', 'nz', 'sg', 'ae',
-            'kr', 'za', 'mx', 'ar', 'cl', 'pl', 'cz', 'gr', 'hu', 'pt', 'ro', 'th',
-            'tr', 'ua', 'vn', 'ph', 'my', 'id', 'tw', 'hk', 'me', 'eu',
-
-            # Common URL words and abbreviations
-            'about', 'info', 'contact', 'support', 'help', 'faq', 'news', 'blog',
-            'corp', 'corporate', 'company', 'inc', 'incorporated', 'llc', 'ltd',
-            'limited', 'group', 'intl', 'international', 'global', 'worldwide',
-            'local', 'official', 'home', 'main', 'index', 'web', 'site', 'portal',
-            'login', 'signup', 'register', 'account', 'user', 'customer', 'client',
-            'partner', 'vendor', 'supplier', 'en', 'eng', 'english', 'fr', 'fra', 
-            'french', 'de', 'deu', 'german', 'es', 'esp', 'spanish', 'it', 'ita', 
-            'italian', 'pt', 'por', 'portuguese', 'ru', 'rus', 'russian', 'cn', 
-            'chi', 'chinese', 'jp', 'jpn', 'japanese',
-
-            # E-commerce related
-            'shop', 'store', 'buy', 'sell', 'sale', 'discount', 'deal', 'offer',
-            'product', 'item', 'catalog', 'category', 'cart', 'checkout', 'payment',
-            'order', 'shipping', 'delivery',
-
-            # Business and corporate terms
-            'careers', 'jobs', 'hr', 'human-resources', 'recruitment', 'investor',
-            'investors', 'shareholders', 'press', 'media', 'pr', 'public-relations',
-            'legal', 'privacy', 'terms', 'conditions', 'policy', 'policies',
-            'services', 'solutions', 'products', 'projects', 'portfolio', 'business',
-
-            # Technology-related
-            'app', 'apps', 'api', 'dev', 'developer', 'webmaster', 'admin', 'sys',
-            'system', 'network', 'host', 'domain', 'email', 'mail', 'webmail',
-            'cloud', 'server', 'database', 'data', 'analytics', 'stats', 'metrics',
-
-            # Social media and community
-            'social', 'community', 'forum', 'chat', 'discuss', 'connect', 'follow',
-            'like', 'share', 'tweet', 'post', 'profile', 'user', 'member',
-
-            # Miscellaneous
-            'page', 'pages', 'site', 'sites', 'web', 'internet', 'online', 'digital',
-            'virtual', 'mobile', 'desktop', 'platform', 'service', 'tool', 'resource',
-            'guide', 'tutorial', 'learn', 'education', 'training', 'course', 'program'
-        }
-        
-        # Comprehensive list of country code TLDs
-        country_codes = {
-            'ac', 'ad', 'ae', 'af', 'ag', 'ai', 'al', 'am', 'ao', 'aq', 'ar', 'as', 'at', 'au', 'aw', 'ax', 'az',
-            'ba', 'bb', 'bd', 'be', 'bf', 'bg', 'bh', 'bi', 'bj', 'bl', 'bm', 'bn', 'bo', 'bq', 'br', 'bs', 'bt',
-            'bv', 'bw', 'by', 'bz', 'ca', 'cc', 'cd', 'cf', 'cg', 'ch', 'ci', 'ck', 'cl', 'cm', 'cn', 'co', 'cr',
-            'cu', 'cv', 'cw', 'cx', 'cy', 'cz', 'de', 'dj', 'dk', 'dm', 'do', 'dz', 'ec', 'ee', 'eg', 'eh', 'er',
-            'es', 'et', 'eu', 'fi', 'fj', 'fk', 'fm', 'fo', 'fr', 'ga', 'gb', 'gd', 'ge', 'gf', 'gg', 'gh', 'gi',
-            'gl', 'gm', 'gn', 'gp', 'gq', 'gr', 'gs', 'gt', 'gu', 'gw', 'gy', 'hk', 'hm', 'hn', 'hr', 'ht', 'hu',
-            'id', 'ie', 'il', 'im', 'in', 'io', 'iq', 'ir', 'is', 'it', 'je', 'jm', 'jo', 'jp', 'ke', 'kg', 'kh',
-            'ki', 'km', 'kn', 'kp', 'kr', 'kw', 'ky', 'kz', 'la', 'lb', 'lc', 'li', 'lk', 'lr', 'ls', 'lt', 'lu',
-            'lv', 'ly', 'ma', 'mc', 'md', 'me', 'mf', 'mg', 'mh', 'mk', 'ml', 'mm', 'mn', 'mo', 'mp', 'mq', 'mr',
-            'ms', 'mt', 'mu', 'mv', 'mw', 'mx', 'my', 'mz', 'na', 'nc', 'ne', 'nf', 'ng', 'ni', 'nl', 'no', 'np',
-            'nr', 'nu', 'nz', 'om', 'pa', 'pe', 'pf', 'pg', 'ph', 'pk', 'pl', 'pm', 'pn', 'pr', 'ps', 'pt', 'pw',
-            'py', 'qa', 're', 'ro', 'rs', 'ru', 'rw', 'sa', 'sb', 'sc', 'sd', 'se', 'sg', 'sh', 'si', 'sk', 'sl',
-            'sm', 'sn', 'so', 'sr', 'ss', 'st', 'sv', 'sx', 'sy', 'sz', 'tc', 'td', 'tf', 'tg', 'th', 'tj', 'tk',
-            'tl', 'tm', 'tn', 'to', 'tr', 'tt', 'tv', 'tw', 'tz', 'ua', 'ug', 'uk', 'us', 'uy', 'uz', 'va', 'vc',
-            've', 'vg', 'vi', 'vn', 'vu', 'wf', 'ws', 'ye', 'yt', 'za', 'zm', 'zw'
-        }
-        return common_terms, country_codes
+        self._cache.clear()
 
     def extract_domain_and_company(self, url: str) -> str:
         """
@@ -99,14 +177,52 @@ class URLPreprocessor:
         Returns:
             str: The extracted company name.
         """
-        # Handle unusual 'http//' cases
-        url = re.sub(r'^https?://http//', 'http://', url)
+        company_name = self._cache.get(url)
+        if company_name is None:
+            # Handle unusual 'http//' cases
+            company_name = self._extract_domain_and_company(_RE_HTTP_HTTP.sub('http://', url))
+            self._cache[url] = company_name
+        
+        return company_name
+
+    def extract_series(self, urls: pd.Series) -> pd.Series:
+        """
+        Extract company names from a Series of URLs.
         
+        URLs seen before are answered from the cache. For the others, the string
+        normalisation runs once through the vectorized ``.str`` accessor and only
+        the suffix-list lookup is done per URL.
+        
+        Args:
+            urls (pd.Series): The input URLs.
+        
+        Returns:
+            pd.Series: The extracted company names, aligned with the input index.
+        """
+        urls = urls.astype(str)
+        new_urls = urls[[url not in self._cache for url in urls]].drop_duplicates()
+        
+        # Handle unusual 'http//' cases for all new URLs at once
+        normalized = new_urls.str.replace(_RE_HTTP_HTTP, 'http://', regex=True)
+        self._cache.update(zip(new_urls, (self._extract_domain_and_company(url) for url in normalized)))
+        
+        return pd.Series([self._cache[url] for url in urls], index=urls.index, dtype=object)
+
+    def _extract_domain_and_company(self, url: str) -> str:
+        """
+        Extract the company name from a URL whose 'http//' prefix is already normalised.
+        
+        Args:
+            url (str): The normalised URL.
+        
+        Returns:
+            str: The extracted company name.
+        """
         # Use tldextract to properly parse the URL
-        extracted = tldextract.extract(url)
+        extracted = _TLD(url)
 
         # If URL is linkedin, facebook or zaubacorp url then change preprocessing
-        if extracted.domain in ['facebook', 'zaubacorp', 'linkedin']:
+        if extracted.domain in _SOCIAL_DOMAINS:
             linkedin_processed = self.preprocess_linkedin_url(url)
             if linkedin_processed:
                 return linkedin_processed
@@ -114,26 +230,19 @@ class URLPreprocessor:
         # Combine domain and suffix
         full_domain = f"{extracted.domain}.{extracted.suffix}"
         
-        # Define common country code TLDs and known common suffixes
-        country_codes = self.country_codes
-        common_suffixes = {'business', 'webflow', 'site', 'com'}
-        
         # Handle cases where the domain is a country code or a common suffix
-        if extracted.subdomain and (extracted.domain in country_codes or extracted.domain in common_suffixes):
+        if extracted.subdomain and (extracted.domain in self.country_codes or extracted.domain in _COMMON_SUFFIXES):
             company_name = f"{extracted.subdomain}.{full_domain}"
         else:
             # Standard case
             company_name = full_domain
         
-        # Remove common prefixes from the domain
-        common_prefixes = ['www', 'web', 'corp', 'corporate', 'about', 'info', 'shop', 'company']
-        domain_parts = company_name.split('.')
-        cleaned_domain_parts = [part for part in domain_parts if part.lower() not in common_prefixes]
+        # Remove common prefixes from the lowercased domain
+        domain_parts = company_name.lower().split('.')
+        cleaned_domain_parts = [part for part in domain_parts if part not in _COMMON_PREFIXES]
         
         # Join the cleaned domain parts
-        company_name = '.'.join(cleaned_domain_parts)
-        
-        return company_name.lower()
+        return '.'.join(cleaned_domain_parts)
 
     def preprocess_linkedin_url(self, url: str) -> str:
         """
@@ -146,21 +255,25 @@ class URLPreprocessor:
             str: The extracted company name.
         """
         # Remove query parameters and 'about' section
-        url = re.sub(r'(\?.*)|(\/about.*)', '', url)
+        if '?' in url or '/about' in url:
+            url = _RE_LINKEDIN_QS.sub('', url)
         
         # Decode any percent-encoded characters
-        url = unquote(url)
+        if '%' in url:
+            url = unquote(url)
         
         # Determine if the URL is a profile or company URL and extract accordingly
-        if '/company/' in url:
-            entity_name = url.rstrip('/').split('/')[-1]
-        elif '/in/' in url:
-            entity_name = url.rstrip('/').split('/')[-1]
+        if '/company/' in url or '/in/' in url:
+            entity_name = url.rstrip('/').rpartition('/')[2]
         else:
             entity_name = url
         
         # Normalize by lowercasing and removing special characters (except hyphens)
-        entity_name = re.sub(r'[^\w\-]', '', entity_name.lower())
+        entity_name = entity_name.lower()
+        if entity_name.isascii():
+            entity_name = entity_name.translate(_ASCII_NONWORD)
+        else:
+            entity_name = _RE_NONWORD.sub('', entity_name)
         
         return entity_name
 
@@ -175,14 +288,14 @@ class URLPreprocessor:
             str: The extracted company name.
         """
 
-        # Remove protocol, www, and handle the unusual http// case
-        url = re.sub(r'^(https?://)?(http//)?((www|web)\.)?', '', url)
+        # Lowercase once, then remove protocol, www, and handle the unusual http// case
+        url = _RE_PROTO_WWW.sub('', url.lower())
         
         # Split the remaining URL by dots and slashes
-        parts = re.split(r'[./]', url)
+        parts = _RE_SPLIT.split(url)
         
         # Filter out common terms and empty strings
-        filtered_parts = [part for part in parts if part and part.lower() not in self.common_terms]
+        filtered_parts = [part for part in parts if part and part not in self.common_terms]
         
         # If filtered_parts is empty, use the original parts without filtering
         if not filtered_parts:
@@ -192,8 +305,7 @@ class URLPreprocessor:
         company_name = '-'.join(filtered_parts)
         
         # Remove common prefixes and suffixes
-        company_name = re.sub(r'^(corp-|corporate-|about-|info-|en-|shop-)', '', company_name)
-        company_name = re.sub(r'-(corp|corporate|about|info|en|shop)$', '', company_name)
+        company_name = _RE_PREFIX_SUFFIX.sub('', company_name)
         
         # If company_name is still empty, use the second level domain
         if not company_name and len(parts) >= 2:
@@ -201,7 +313,7 @@ class URLPreprocessor:
         
         return company_name
 
-    def find_best_match_with_distance_poly(self, cd_company: str, crm_companys: List[str]) -> Tuple[str, float]:
+    def find_best_match(self, cd_company: str, crm_companys: List[str]) -> Tuple[str, float]:
         """
         Find the best match for a company name using Levenshtein distance.
         
@@ -210,18 +322,47 @@ class URLPreprocessor:
             crm_companys (List[str]): List of company names to match against.
         
         Returns:
-            Tuple[str, float]: The best matching company name and its Levenshtein distance.
+            Tuple[str, float]: The best matching company name and its Levenshtein distance,
+                or None and float('inf') when there is nothing to match against.
         """
-        best_match = None
-        min_distance = float('inf')
-        for crm_company in crm_companys:
-            dist = levenshtein(cd_company, crm_company)
-            if dist < min_distance:
-                min_distance = dist
-                best_match = crm_company
-        return best_match, min_distance
-
-    def process_companys(self, crm_companys: List[str], cd_companys: List[str], match_type: Literal["exact", "fuzzy", None] = None) -> List[Tuple[str, str, float]]:
+        best = rf_process.extractOne(cd_company, crm_companys, scorer=Levenshtein.distance)
+        if best is None:
+            return None, float('inf')
+        return best[0], best[1]
+
+    def find_best_match_with_distance_poly(self, cd_company: str, crm_companys: List[str]) -> Tuple[str, float]:
+        """
+        Alias of find_best_match, kept for callers of its former name.
+        """
+        return self.find_best_match(cd_company, crm_companys)
+
+    def _best_matches(self, queries: List[str], choices: List[str], progress: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the closest choice for every query by Levenshtein distance.
+        
+        Queries are scored in blocks against all choices at once, bounding the
+        size of the distance matrix to MAX_SCORE_CELLS.
+        
+        Args:
+            queries (List[str]): Company names to match.
+            choices (List[str]): Non-empty list of candidate company names.
+            progress (bool, optional): Show a progress bar over the blocks. Default is False.
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The position in choices of the best match and its distance, per query.
+        """
+        best = np.empty(len(queries), dtype=np.intp)
+        distances = np.empty(len(queries), dtype=np.uint32)
+        block_size = max(1, MAX_SCORE_CELLS // len(choices))
+        for start in tqdm(range(0, len(queries), block_size), desc="Fuzzy Matching", disable=not progress):
+            block = queries[start:start + block_size]
+            scores = rf_process.cdist(block, choices, scorer=Levenshtein.distance,
+                                      dtype=np.uint32, workers=-1)
+            best[start:start + len(block)], distances[start:start + len(block)] = _argmin_rows(scores)
+        return best, distances
+
+    def process_companys(self, crm_companys: List[str], cd_companys: List[str], match_type: Literal["exact", "fuzzy", None] = None,
+                         block_prefix: int = 0) -> List[Tuple[str, str, float]]:
         """
         Process company names to find matches.
         
@@ -229,18 +370,59 @@ class URLPreprocessor:
             crm_companys (List[str]): List of CRM company names.
             cd_companys (List[str]): List of CD company names.
             match_type (Literal["exact", "fuzzy", None]): Type of matching to perform.
+            block_prefix (int, optional): For fuzzy matching, only score CD companies sharing this many
+                leading characters (case-insensitive) with the CRM company, falling back to all CD companies
+                when none do. Faster, but may miss closer matches outside the block. Default is 0 (no blocking).
         
         Returns:
             List[Tuple[str, str, float]]: List of tuples containing (crm_company, matched_cd_company, distance).
         """
         results = []
         if match_type == "exact":
-            set1 = set(cd_companys)
-            results = [(item, item, 0) if item in set1 else (item, None, float('inf')) for item in tqdm(crm_companys, desc="Exact Matching")]
+            # Hash all CRM companies against the CD companies in a single vectorized lookup
+            crm_series = pd.Series(crm_companys, dtype=object)
+            found = crm_series.isin(pd.Series(cd_companys, dtype=object)).tolist()
+            results = [(item, item, 0) if is_found else (item, None, float('inf'))
+                       for item, is_found in zip(crm_series.tolist(), found)]
         else:
-            for crm_company in tqdm(crm_companys, desc="Fuzzy Matching"):
-                best_match, distance = self.find_best_match_with_distance_poly(crm_company, cd_companys)
-                results.append((crm_company, best_match, distance))
+            crm_companys = list(crm_companys)
+            
+            # Score each distinct name once; pd.unique keeps first occurrences, so ties resolve as before
+            cd_companys = pd.unique(pd.Series(cd_companys, dtype=object)).tolist()
+            codes, crm_unique = pd.factorize(pd.Series(crm_companys, dtype=object), use_na_sentinel=False)
+            crm_unique = crm_unique.tolist()
+            
+            if not cd_companys:
+                # Nothing to match against
+                best = np.zeros(len(crm_unique), dtype=np.intp)
+                distances = np.full(len(crm_unique), _NO_MATCH, dtype=np.uint32)
+            elif block_prefix:
+                # Group the names by their leading characters and score each group against its own block only
+                cd_blocks = defaultdict(list)
+                for j, cd_company in enumerate(cd_companys):
+                    cd_blocks[str(cd_company)[:block_prefix].lower()].append(j)
+                crm_blocks = defaultdict(list)
+                for i, crm_company in enumerate(crm_unique):
+                    crm_blocks[str(crm_company)[:block_prefix].lower()].append(i)
+                
+                best = np.empty(len(crm_unique), dtype=np.intp)
+                distances = np.empty(len(crm_unique), dtype=np.uint32)
+                for key, rows in tqdm(crm_blocks.items(), desc="Fuzzy Matching", mininterval=1.0,
+                                      miniters=max(1, len(crm_blocks) // 200)):
+                    candidates = cd_blocks.get(key)
+                    if candidates is None:
+                        candidates = range(len(cd_companys))
+                    block_best, block_distances = self._best_matches([crm_unique[i] for i in rows],
+                                                                     [cd_companys[j] for j in candidates])
+                    best[rows] = np.asarray(candidates)[block_best]
+                    distances[rows] = block_distances
+            else:
+                best, distances = self._best_matches(crm_unique, cd_companys, progress=True)
+            
+            # Map the results of the distinct names back to every input row, converting the sentinel at the boundary
+            results = [(crm_company, cd_companys[j], distance) if distance != _NO_MATCH
+                       else (crm_company, None, float('inf'))
+                       for crm_company, j, distance in zip(crm_companys, best[codes].tolist(), distances[codes].tolist())]
         
         return results
 
@@ -1,6 +1,7 @@
 import pandas as pd
 from matcher import Matcher
-from postprocess import get_bd_linkedin_company_urls, process_all_matched_outputs
+from postprocess import (anti_join, get_bd_linkedin_company_urls, process_all_matched_outputs,
+                         process_matched_output, read_id_table)
 
 # Initialize the matcher object
 matcher = Matcher()
@@ -14,8 +15,11 @@ print()
 # Test Case 2: Empty DataFrame
 print("Test Case 2: Empty DataFrame")
 empty_df = pd.DataFrame()
-result = matcher.preprocess_urls(empty_df, 'url', 'company')
-print("Output:", result)
+try:
+    result = matcher.preprocess_urls(empty_df, 'url', 'company')
+    print("Output:", result)
+except ValueError as e:
+    print("Output: ValueError occurred:", e)
 print()
 
 # Test Case 3: DataFrame with null values
@@ -61,11 +65,8 @@ print()
 # Test Case 7: Process non-existent matched outputs
 print("Test Case 7: Process non-existent matched outputs")
 try:
-    operations = [{
-        "matched_path": 'dummy_matched.csv',
-        "unmatched_path": 'dummy_unmatched.csv'
-    }]
-    process_all_matched_outputs(operations)
+    matched_paths = ['dummy_matched.csv']
+    process_all_matched_outputs(matched_paths)
 except FileNotFoundError as e:
     print("Output: FileNotFoundError occurred:", e)
 except Exception as e:
@@ -101,10 +102,136 @@ print("Test Case 10: Test process with correct files but empty content")
 df_empty = pd.DataFrame(columns=['id', 'url', 'company'])
 df_empty.to_csv('dummy_matched.csv', index=False)
 try:
-    process_all_matched_outputs([{
-        "matched_path": 'dummy_matched.csv',
-        "unmatched_path": 'dummy_unmatched.csv'
-    }])
+    process_all_matched_outputs(['dummy_matched.csv'])
 except Exception as e:
     print("Output: Exception occurred:", e)
-print()
\ No newline at end of file
+print()
+
+# Test Case 11: Extract company names from a column of URLs
+print("Test Case 11: Extract company names from a column of URLs")
+df_urls = pd.DataFrame({
+    'id': [1, 2, 3, 4],
+    'url': ['https://www.example.com', 'https://http//unusual-url-format.org', 'http://linkedin.com/company/microsoft', None]
+})
+result = matcher.preprocess_urls(df_urls, 'url', 'company')
+print("Output:\n", result)
+print()
+
+# Test Case 12: Load zero-padded and long IDs from a CSV file as text
+print("Test Case 12: Load zero-padded and long IDs from a CSV file as text")
+pd.DataFrame({
+    'ID': ['00042', '12345678901234567890123', None],
+    'URL': ['http://example.com', 'http://test.com', 'http://other.com']
+}).to_csv('dummy_ids.csv', index=False)
+result = matcher.load_clean_and_rename_dataframe('dummy_ids.csv', 'CRM_ID', 'URL', {'ID': 'CRM_ID'})
+print("Output:\n", result)
+print()
+
+# Test Case 13: Exclude matched CRM rows with zero-padded IDs from the LinkedIn input
+print("Test Case 13: Exclude matched CRM rows with zero-padded IDs from the LinkedIn input")
+pd.DataFrame({
+    'ID': ['00015', '00016', '00017'],
+    'COMPANY_WEBSITE': ['http://example.com', 'http://test.com', 'http://other.com']
+}).to_csv('dummy_crm.csv', index=False)
+matched_crm = matcher.load_clean_and_rename_dataframe('dummy_crm.csv', 'CRM_ID', 'COMPANY_WEBSITE', {'ID': 'CRM_ID'})
+matched_crm = matched_crm[matched_crm['CRM_ID'] != '00017']
+result = anti_join(read_id_table('dummy_crm.csv', ['ID']), 'ID', matched_crm['CRM_ID'])
+print("Output:\n", result)
+print()
+
+# Test Case 14: An ID with any matched URL is not reported as unmatched
+print("Test Case 14: An ID with any matched URL is not reported as unmatched")
+pd.DataFrame({
+    'ID': ['C1', 'C1', 'C2'],
+    'COMPANY_WEBSITE': ['http://example.com', 'http://unknown.com', 'http://other.com']
+}).to_csv('dummy_crm.csv', index=False)
+pd.DataFrame({
+    'UUID': ['U1'],
+    'HOMEPAGE_URL': ['https://www.example.com']
+}).to_csv('dummy_cb.csv', index=False)
+result = matcher.process('dummy_crm.csv', 'dummy_cb.csv', 'CRM_ID', 'UUID', 'COMPANY_WEBSITE', 'HOMEPAGE_URL',
+                         'crm_company', 'cb_company', 'dummy_matched.csv', 'dummy_unmatched.csv',
+                         rename_dict1={'ID': 'CRM_ID'})
+print("Output:\n", result)
+print("Unmatched:\n", pd.read_csv('dummy_unmatched.csv'))
+print()
+
+# Test Case 15: Fuzzy matching with and without prefix blocking
+print("Test Case 15: Fuzzy matching with and without prefix blocking")
+df1 = pd.DataFrame({
+    'id1': [1, 2, 3],
+    'url1': ['http://acme.com', 'http://zenith.io', 'http://quark.net'],
+    'company1': ['acme', 'zenith', 'quark']
+})
+df2 = pd.DataFrame({
+    'id2': [10, 20, 30, 40],
+    'url2': ['http://acne.com', 'http://xenith.io', 'http://zenit.io', 'http://quart.net'],
+    'company2': ['acne', 'xenith', 'zenit', 'quart']
+})
+result = matcher.match_companies(df1, df2, 'company1', 'company2', 'id1', 'id2', 'url1', 'url2', match_type='fuzzy')
+print("Output without blocking:\n", result)
+result = matcher.match_companies(df1, df2, 'company1', 'company2', 'id1', 'id2', 'url1', 'url2', match_type='fuzzy',
+                                 block_prefix=2)
+print("Output with blocking:\n", result)
+result = matcher.preprocessor.process_companys(['zenith', 'acme', 'bolt'], ['xenith', 'acne', 'zenit'],
+                                              match_type='fuzzy', block_prefix=2)
+print("Output of process_companys with blocking and an unblocked company:", result)
+print()
+
+# Test Case 16: Extract company names from URLs regardless of their case
+print("Test Case 16: Extract company names from URLs regardless of their case")
+urls = ['https://www.example.com', 'HTTPS://WWW.Example.CO.UK/Home', 'http//unusual-url-format.org',
+        'https://apple.com/about', 'corp-acme.com', 'about.com']
+print("Output:", [matcher.preprocessor.extract_company_name(url) for url in urls])
+print()
+
+# Test Case 17: Load a CSV file with multi-line quoted fields in an unselected column
+# The file is larger than the CSV reader's block size, so the fields span block boundaries
+print("Test Case 17: Load a CSV file with multi-line quoted fields in an unselected column")
+pd.DataFrame({
+    'ID': [f"{i:05d}" for i in range(30000)],
+    'NOTES': 'first line\nsecond line',
+    'URL': 'http://example.com'
+}).to_csv('dummy_notes.csv', index=False)
+result = matcher.load_clean_and_rename_dataframe('dummy_notes.csv', 'ID', 'URL')
+print("Output shape:", None if result is None else result.shape)
+print()
+
+# Test Case 18: Split duplicate matches without changing zero-padded IDs
+print("Test Case 18: Split duplicate matches without changing zero-padded IDs")
+with open('dummy_ids_matched.csv', 'w') as f:
+    f.write("CRM_ID,ID,COMPANY\n00066,0001,acme\n00067,,acme\n00068,0003,test\n")
+process_matched_output('dummy_ids_matched.csv', chunksize=2)
+print("Non-duplicates:\n" + open('dummy_ids_matched.csv').read())
+print("Duplicates:\n" + open('dummy_ids_duplicate_matched.csv').read())
+print()
+
+# Test Case 19: A second identical load is served from the cache
+print("Test Case 19: A second identical load is served from the cache")
+cache_matcher = Matcher()
+first = cache_matcher.load_clean_and_rename_dataframe('dummy_ids.csv', 'CRM_ID', 'URL', {'ID': 'CRM_ID'})
+cached_tables = len(cache_matcher._frame_cache)
+second = cache_matcher.load_clean_and_rename_dataframe('dummy_ids.csv', 'CRM_ID', 'URL', {'ID': 'CRM_ID'})
+print("Output: tables cached after each load:", cached_tables, len(cache_matcher._frame_cache),
+      "same data:", first.equals(second))
+print()
+
+# Test Case 20: Match tables whose IDs and URLs repeat, which are loaded as categoricals
+print("Test Case 20: Match tables whose IDs and URLs repeat, which are loaded as categoricals")
+pd.DataFrame({
+    'ID': ['C1', 'C1', 'C1', 'C1', 'C2', 'C2'],
+    'COMPANY_WEBSITE': ['http://example.com', 'http://example.com', 'http://example.com',
+                        'http://example.com', 'http://other.com', 'http://other.com']
+}).to_csv('dummy_crm.csv', index=False)
+pd.DataFrame({
+    'UUID': ['U1', 'U1', 'U1', 'U1'],
+    'HOMEPAGE_URL': ['https://www.example.com'] * 4
+}).to_csv('dummy_cb.csv', index=False)
+print("Loaded dtypes:", matcher.load_clean_and_rename_dataframe('dummy_crm.csv', 'CRM_ID', 'COMPANY_WEBSITE',
+                                                                 {'ID': 'CRM_ID'}).dtypes.to_dict())
+result = matcher.process('dummy_crm.csv', 'dummy_cb.csv', 'CRM_ID', 'UUID', 'COMPANY_WEBSITE', 'HOMEPAGE_URL',
+                         'crm_company', 'cb_company', 'dummy_matched.csv', 'dummy_unmatched.csv',
+                         rename_dict1={'ID': 'CRM_ID'})
+print("Output shape:", None if result is None else result.shape)
+print("Unmatched:\n", pd.read_csv('dummy_unmatched.csv'))
+print()